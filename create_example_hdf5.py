@@ -5,7 +5,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, 'src')
 
-from configurations.configuration import parse_xyz_header, Configuration
+from configurations.configuration import Configuration
 
 # Create example HDF5 file
 xyz_path = Path('data/P150T2000config60/P150T2000config60.xyz')
@@ -15,13 +15,15 @@ print("Creating example HDF5 file...")
 print(f"Input XYZ: {xyz_path}")
 print(f"Output HDF5: {output_path}")
 
-# # Parse metadata from XYZ file
-# print("\n1. Parsing metadata from XYZ file...")
-# meta = parse_xyz_header(xyz_path)
+# Read the XYZ file once and hand the buffer to Configuration, which
+# parses the header and writes xyz_data from the same bytes
+print("\n1. Reading XYZ file...")
+raw = xyz_path.read_bytes()
+print(f"   ✓ Read {len(raw)} bytes")
 
 # Create Configuration object
 print("\n2. Creating Configuration object...")
-config = Configuration(xyz_path)
+config = Configuration(xyz_path, data=raw)
 print(f"   ✓ Configuration created")
 print(f"     - xyz: {config.xyz_path.name}")
 print(f"     - sofk_txt: {config.sofk_txt_path.name if config.sofk_txt_path else 'NOT FOUND'}")
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 """Script to read and describe the intake catalog."""
+import io
 import os
 
 import h5py
@@ -64,23 +65,42 @@ table.add_column("Model", style="blue")
 table.add_column("Potential Energy (eV)", style="red", justify="right")
 table.add_column("Datasets", style="dim")
 
-for row in high_pressure.itertuples():
-    with fs.open(row.uri, 'rb') as f:
-        with h5py.File(f, 'r') as h5f:
-            attrs = dict(h5f.attrs)
-            datasets = list(h5f.keys())
-
-            table.add_row(
-                str(attrs.get("config_number", "-")),
-                str(attrs.get("pressure", "-")),
-                str(attrs.get("temperature", "-")),
-                str(attrs.get("state", "-")),
-                f"{attrs.get('rs', '-'):.2f}" if attrs.get("rs") else "-",
-                f"{attrs.get('molecular_percentage', '-'):.1f}" if attrs.get("molecular_percentage") else "-",
-                str(attrs.get("method", "-")),
-                str(attrs.get("modelname", "-")),
-                f"{attrs.get('potential_energy', '-'):.4f}" if attrs.get("potential_energy") else "-",
-                ", ".join(datasets),
-            )
+# Only the attributes the table actually renders; each HDF5 attribute
+# read is individually expensive, so skip the rest
+NEEDED = ("config_number", "pressure", "temperature", "state", "rs",
+          "molecular_percentage", "method", "modelname", "potential_energy")
+
+# These files are small, so the per-file TCP round-trip dominates.
+# fs.cat fires one pooled, concurrent batch of GETs for all of them;
+# parsing then happens locally on in-memory bytes.
+rows = list(high_pressure.itertuples())
+# fs.cat keys its result dict by protocol-stripped paths ('bucket/key'),
+# not the 's3://bucket/key' URIs we pass in, so normalize before lookup
+blobs = fs.cat([row.uri for row in rows])
+
+for row in rows:
+    with h5py.File(io.BytesIO(blobs[fs._strip_protocol(row.uri)]), 'r') as h5f:
+        attrs = {k: h5f.attrs[k] for k in NEEDED if k in h5f.attrs}
+        datasets = list(h5f.keys())
+
+        # Newer files store state as a 1-byte enum code; map it back to
+        # its name via the enum type (older files stored the plain string)
+        if "state" in attrs and not isinstance(attrs["state"], str):
+            enum_names = h5py.check_enum_dtype(h5f.attrs.get_id("state").dtype) or {}
+            code_to_name = {v: k for k, v in enum_names.items()}
+            attrs["state"] = code_to_name.get(int(attrs["state"]), attrs["state"])
+
+    table.add_row(
+        str(attrs.get("config_number", "-")),
+        str(attrs.get("pressure", "-")),
+        str(attrs.get("temperature", "-")),
+        str(attrs.get("state", "-")),
+        f"{attrs.get('rs', '-'):.2f}" if attrs.get("rs") else "-",
+        f"{attrs.get('molecular_percentage', '-'):.1f}" if attrs.get("molecular_percentage") else "-",
+        str(attrs.get("method", "-")),
+        str(attrs.get("modelname", "-")),
+        f"{attrs.get('potential_energy', '-'):.4f}" if attrs.get("potential_energy") else "-",
+        ", ".join(datasets),
+    )
 
 console.print(table)
\ No newline at end of file
@@ -1,32 +1,64 @@
 """Command-line interface for the configurations tool."""
 
+import functools
 import typer
 from rich.console import Console
 from rich import print as rprint
 from typing import Optional
+import concurrent.futures
 import re
+import types
 from pathlib import Path
 from dotenv import load_dotenv
-import boto3
 import os
-import s3fs
-import h5py
-from .configuration import Configuration
-from .models import ConfigurationMeta, State
-import pandas as pd
+
+# Heavy dependencies (boto3, s3fs, h5py, pandas, and ASE via
+# Configuration) are imported inside the commands that use them:
+# importing them at module scope costs hundreds of ms of startup for
+# commands like --help that never touch S3 or HDF5.
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize S3 client
-s3_client = boto3.client(
-    's3',
-    endpoint_url=os.getenv('S3_ENDPOINT_URL'),
-    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-    region_name=os.getenv('AWS_REGION', 'us-east-1')
+# Snapshot of the S3-related environment, taken once at module load (after
+# load_dotenv). This both avoids repeated os.getenv lookups in loops and
+# documents in one place which settings the CLI consumes.
+_S3_CFG = types.SimpleNamespace(
+    endpoint=os.getenv('S3_ENDPOINT_URL'),
+    key=os.getenv('AWS_ACCESS_KEY_ID'),
+    secret=os.getenv('AWS_SECRET_ACCESS_KEY'),
+    region=os.getenv('AWS_REGION', 'us-east-1'),
+    bucket=os.getenv('BUCKET'),
+    prefix=os.getenv('PREFIX', '')
 )
 
+@functools.cache
+def _get_s3_client():
+    """Build the S3 client from the environment on first use.
+
+    Cached so repeated uploads in one process reuse the same client and
+    its connection pool instead of re-negotiating credentials and TLS.
+    """
+    import boto3
+    return boto3.client(
+        's3',
+        endpoint_url=_S3_CFG.endpoint,
+        aws_access_key_id=_S3_CFG.key,
+        aws_secret_access_key=_S3_CFG.secret,
+        region_name=_S3_CFG.region
+    )
+
+def _get_transfer_config():
+    """Upload HDF5 files >8 MB as concurrent multipart uploads; smaller
+    files still go up in a single PUT."""
+    from boto3.s3.transfer import TransferConfig
+    return TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=16,
+        use_threads=True
+    )
+
 app = typer.Typer(
     name="configurations",
     help="Manage atomic configurations",
@@ -34,32 +66,70 @@ app = typer.Typer(
 )
 console = Console()
 
+def _get_fs():
+    """Return the shared S3 filesystem.
+
+    s3fs caches instances by constructor arguments, so every caller gets
+    the same object and its aiohttp connection pool — TLS handshakes and
+    DNS lookups are paid once per process, not once per call.
+    """
+    import s3fs
+    return s3fs.S3FileSystem(
+        endpoint_url=_S3_CFG.endpoint,
+        key=_S3_CFG.key,
+        secret=_S3_CFG.secret,
+        use_listings_cache=True,
+        # A block this size usually covers a whole per-config file, so
+        # any handle-based read resolves in one ranged GET
+        default_block_size=8 * 1024 * 1024,
+        default_cache_type='readahead'
+    )
+
+# Compiled once at module load; re.match with a string literal pays a
+# cache lookup on every call, which adds up over thousands of xyz files
+_P_RE = re.compile(r'P(\d+)')
+_T_RE = re.compile(r'T(\d+)')
+
 def parse_pressure_from_dir(dir_name: str) -> int:
     """Extract pressure value from directory name (e.g. 'P225' -> 225)."""
-    match = re.match(r'P(\d+)', dir_name)
+    match = _P_RE.match(dir_name)
     if not match:
         raise ValueError(f"Invalid pressure directory name: {dir_name}")
     return int(match.group(1))
 
 def parse_temperature_from_dir(dir_name: str) -> int:
     """Extract temperature value from directory name (e.g. 'T1000' -> 1000)."""
-    match = re.match(r'T(\d+)', dir_name)
+    match = _T_RE.match(dir_name)
     if not match:
         raise ValueError(f"Invalid temperature directory name: {dir_name}")
     return int(match.group(1))
 
-def process_xyz_file(file_path: Path, pressure: int, temperature: int):
-    """Process a single xyz file and create a configuration."""
-    try:
-        # Create configuration meta with pressure and temperature
-        meta = ConfigurationMeta(pressure=pressure, temperature=temperature)
-        
-        # Create configuration
-        config = Configuration(file_path, meta)
-        rprint(config)
-        
-    except Exception as e:
-        rprint(f"[red]Error processing file {file_path}: {str(e)}[/red]")
+def process_xyz_file(xyz_file: str, output_dir: str) -> tuple:
+    """Process a single xyz file into its own HDF5 shard.
+
+    Runs in a worker process, so it takes and returns plain strings
+    (picklable) and opens its own HDF5 file — h5py file handles are not
+    fork-safe and must never be shared across processes.
+
+    Args:
+        xyz_file: Path to the xyz file
+        output_dir: Directory where the shard HDF5 file is written
+
+    Returns:
+        Tuple of (group_name, shard_filename) used to link the shard
+        into the index file
+    """
+    from .configuration import Configuration
+
+    xyz_path = Path(xyz_file)
+    config = Configuration(xyz_path)
+    shard_path = Path(output_dir) / config.hdf5_filename
+    config.save_to_hdf5(shard_path)
+    group_name = (
+        f"P{config.meta.pressure}/T{config.meta.temperature}"
+        f"/config_{config.meta.config_number}"
+    )
+    return group_name, shard_path.name
 
 @app.command()
 def create(
@@ -69,58 +139,204 @@ def create(
     output: str = typer.Argument(
         help="Directory where to output HDF5 file"
     ),
+    no_local: bool = typer.Option(
+        False, "--no-local",
+        help="Build the HDF5 file in memory and upload it straight to S3 "
+             "without writing a local copy"
+    ),
 ):
     """Create a configuration from a single xyz file.
-    
+
     The filename should be in the format: P{pressure}T{temperature}_config_{number}.xyz
-    
+
     Example usage:
         configurations create P150T2400_config_0.xyz ./output
     """
+    from .configuration import Configuration
+
     try:
         xyz_path = Path(file)
         if not xyz_path.exists():
             raise ValueError(f"File {file} does not exist")
-        
-        output_path = Path(output)
-        if not output_path.exists():
-            output_path.mkdir(parents=True)
-        
-        rprint(f"[cyan]Creating HDF5 file at {output_path}...[/cyan]")
+
+        bucket = _S3_CFG.bucket
+        prefix = _S3_CFG.prefix
+        if no_local and not bucket:
+            raise ValueError("--no-local requires the BUCKET environment variable")
 
         # Create configuration
         config = Configuration(xyz_path)
         rprint(f"[green]Processing {xyz_path}...[/green]")
 
-        hdf5_file = output_path / config.hdf5_filename
+        if no_local:
+            # Skip the local disk round-trip entirely: build the file in a
+            # memory buffer and push it with a single put_object call
+            s3_key = f"{prefix}/{config.s3_key}" if prefix else config.s3_key
+            try:
+                _get_s3_client().put_object(
+                    Bucket=bucket, Key=s3_key, Body=config.to_hdf5_bytes()
+                )
+                rprint(f"[green]Successfully uploaded to S3: s3://{bucket}/{s3_key}[/green]")
+            except Exception as e:
+                rprint(f"[red]Failed to upload to S3: {str(e)}[/red]")
+                raise typer.Exit(1)
+            return
+
+        output_path = Path(output)
+        if not output_path.exists():
+            output_path.mkdir(parents=True)
 
-        # Delete HDF5 file if it exists
-        if hdf5_file.exists():
-            hdf5_file.unlink()
-            rprint(f"[yellow]Deleted existing HDF5 file at {hdf5_file}[/yellow]")
+        rprint(f"[cyan]Creating HDF5 file at {output_path}...[/cyan]")
+
+        hdf5_file = output_path / config.hdf5_filename
 
-        # Save configuration to HDF5
-        config.save_to_hdf5(hdf5_file)
+        # Save to a temporary path, then publish with a single atomic
+        # rename: a crash mid-write leaves the old file intact, and there
+        # is no unlink/create window with no file at all
+        tmp_file = hdf5_file.with_suffix('.hdf5.tmp')
+        config.save_to_hdf5(tmp_file)
+        os.replace(tmp_file, hdf5_file)
         rprint(f"[green]HDF5 file created successfully at {hdf5_file}[/green]")
-        
+
         # Upload to S3
-        bucket = os.getenv('BUCKET')
-        prefix = os.getenv('PREFIX', '')
         if bucket:
             s3_key = f"{prefix}/{config.s3_key}" if prefix else config.s3_key
             try:
-                s3_client.upload_file(hdf5_file, bucket, s3_key)
+                _get_s3_client().upload_file(
+                    str(hdf5_file), bucket, s3_key, Config=_get_transfer_config()
+                )
                 rprint(f"[green]Successfully uploaded to S3: s3://{bucket}/{s3_key}[/green]")
             except Exception as e:
                 rprint(f"[red]Failed to upload to S3: {str(e)}[/red]")
         else:
-            rprint("[yellow]S3_BUCKET environment variable not set, skipping S3 upload[/yellow]")
+            rprint("[yellow]BUCKET environment variable not set, skipping S3 upload[/yellow]")
 
     except Exception as e:
         rprint(f"[red]Error creating HDF5 file: {str(e)}[/red]")
         raise typer.Exit(1)
 
 
+@app.command()
+def create_batch(
+    data_dir: str = typer.Argument(
+        help="Directory containing P{pressure}/T{temperature}/*.xyz subtrees"
+    ),
+    output: str = typer.Argument(
+        help="Directory where to output the HDF5 shards and index file"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, help="Number of worker processes (defaults to the CPU count)"
+    ),
+):
+    """Create configurations from a whole P*/T* directory tree in parallel.
+
+    Walks data_dir/P{pressure}/T{temperature}/*.xyz, converts each xyz file
+    into its own HDF5 shard using a process pool, then stitches the shards
+    into a single index.hdf5 via external links so the whole collection can
+    be opened as one file.
+
+    Example usage:
+        configurations create-batch /path/to/data_dir ./output
+    """
+    import h5py
+
+    try:
+        data_path = Path(data_dir)
+        if not data_path.is_dir():
+            raise ValueError(f"Directory {data_dir} does not exist")
+
+        output_path = Path(output)
+        if not output_path.exists():
+            output_path.mkdir(parents=True)
+
+        # Collect all xyz files, validating the P*/T* directory names as we
+        # go. os.scandir is used instead of Path.glob because DirEntry
+        # caches the file type from the directory read itself, avoiding an
+        # extra stat syscall per entry — the dominant cost on networked
+        # filesystems.
+        xyz_files = []
+        with os.scandir(data_path) as pressure_it:
+            for pressure_entry in pressure_it:
+                if not (pressure_entry.is_dir() and pressure_entry.name.startswith('P')):
+                    continue
+                parse_pressure_from_dir(pressure_entry.name)
+                with os.scandir(pressure_entry.path) as temperature_it:
+                    for temperature_entry in temperature_it:
+                        if not (temperature_entry.is_dir() and temperature_entry.name.startswith('T')):
+                            continue
+                        parse_temperature_from_dir(temperature_entry.name)
+                        with os.scandir(temperature_entry.path) as xyz_it:
+                            xyz_files.extend(
+                                Path(e.path) for e in xyz_it
+                                if e.is_file() and e.name.endswith('.xyz')
+                            )
+
+        if not xyz_files:
+            rprint(f"[yellow]No xyz files found under {data_dir}[/yellow]")
+            return
+
+        rprint(f"[cyan]Processing {len(xyz_files)} xyz files with a process pool...[/cyan]")
+
+        # One task per xyz file; each worker writes its own shard so no
+        # HDF5 handle crosses a process boundary
+        results = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(process_xyz_file, str(xyz_file), str(output_path)): xyz_file
+                for xyz_file in xyz_files
+            }
+            for future in concurrent.futures.as_completed(futures):
+                xyz_file = futures[future]
+                try:
+                    results.append(future.result())
+                    rprint(f"[green]Processed {xyz_file}[/green]")
+                except Exception as e:
+                    rprint(f"[red]Error processing file {xyz_file}: {str(e)}[/red]")
+
+        # Stitch the shards into a single index file with external links.
+        # Relative link targets keep the output directory relocatable.
+        index_path = output_path / "index.hdf5"
+        with h5py.File(index_path, "w", libver="latest") as index_file:
+            # Create each P/T parent group exactly once up front (with
+            # creation-order tracking left at its off default) instead of
+            # letting every link assignment re-traverse and create the
+            # intermediate groups
+            parents = {group_name.rsplit('/', 1)[0] for group_name, _ in results}
+            groups = {parent: index_file.create_group(parent) for parent in sorted(parents)}
+            for group_name, shard_name in sorted(results):
+                parent, config_name = group_name.rsplit('/', 1)
+                groups[parent][config_name] = h5py.ExternalLink(shard_name, "/")
+
+        rprint(f"[green]Created {len(results)} shards and index at {index_path}[/green]")
+
+        # Upload the shards through one shared client and S3Transfer so
+        # every upload reuses the same connection pool; the uploads are
+        # network-bound, so a thread pool overlaps them
+        bucket = _S3_CFG.bucket
+        prefix = _S3_CFG.prefix
+        if bucket:
+            from boto3.s3.transfer import S3Transfer
+            transfer = S3Transfer(_get_s3_client(), _get_transfer_config())
+
+            def upload(result):
+                group_name, shard_name = result
+                s3_key = f"{group_name.rsplit('/', 1)[0]}/{shard_name}"
+                if prefix:
+                    s3_key = f"{prefix}/{s3_key}"
+                transfer.upload_file(str(output_path / shard_name), bucket, s3_key)
+                return s3_key
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                for s3_key in executor.map(upload, results):
+                    rprint(f"[green]Uploaded s3://{bucket}/{s3_key}[/green]")
+        else:
+            rprint("[yellow]BUCKET environment variable not set, skipping S3 upload[/yellow]")
+
+    except Exception as e:
+        rprint(f"[red]Error creating batch: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+
 @app.command()
 def catalog(
         catalog_path: Optional[str] = typer.Option("catalog.csv", help="Path to the CSV catalog file")
@@ -128,10 +344,13 @@ def catalog(
     """List all HDF5 configurations in the S3 bucket and their group attributes.
         Generate a CSV file with all attributes along with the URL to the HDF5 file.
     """
+    import pandas as pd
+    from .configuration import Configuration
+
     try:
         df = None
-        bucket = os.getenv('BUCKET')
-        prefix = os.getenv('PREFIX', '')
+        bucket = _S3_CFG.bucket
+        prefix = _S3_CFG.prefix
         
         if not bucket:
             rprint("[red]BUCKET environment variable not set[/red]")
@@ -139,35 +358,46 @@ def catalog(
             
         rprint(f"[cyan]Listing HDF5 files and their attributes in s3://{bucket}/{prefix}...[/cyan]")
 
-        # Initialize s3fs
-        fs = s3fs.S3FileSystem(
-            endpoint_url=os.getenv('S3_ENDPOINT_URL'),
-            key=os.getenv('AWS_ACCESS_KEY_ID'),
-            secret=os.getenv('AWS_SECRET_ACCESS_KEY')
-        )
-
-        # List objects in the bucket with the prefix
-        paginator = s3_client.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    if key.endswith('.hdf5'):
-                        try:
-                            rprint(f"\n[bold green]{key}[/bold green]")
-                            attributes = Configuration.read_hdf5_attributes(bucket, key, fs)
-                            for attr_name, attr_value in attributes.items():
-                                rprint(f"  {attr_name}: {attr_value}")
-
-                            row_df = pd.DataFrame([attributes], index=[0])
-                            row_df['uri'] = f's3://{bucket}/{key}'
-                            if df is None:
-                                df = row_df
-                            else:
-                                df = pd.concat([df, row_df], ignore_index=True)
-
-                        except Exception as e:
-                            rprint(f"[red]Error reading {key}: {str(e)}[/red]")
+        # One shared filesystem for both listing and reading — no separate
+        # boto3 paginator session just to enumerate keys
+        fs = _get_fs()
+        keys = [
+            path[len(bucket) + 1:]
+            for path in fs.find(f"{bucket}/{prefix}")
+            if path.endswith('.hdf5')
+        ]
+
+        # Fetch all attribute sets concurrently — each read is dominated
+        # by S3 round-trips — and stream results as they arrive so fast
+        # files print while slow ones are still in flight
+        rows = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
+            futures = {
+                executor.submit(Configuration.read_hdf5_attributes, bucket, key, fs): key
+                for key in keys
+            }
+            for future in concurrent.futures.as_completed(futures):
+                key = futures[future]
+                try:
+                    attributes = future.result()
+                    rprint(f"\n[bold green]{key}[/bold green]")
+                    for attr_name, attr_value in attributes.items():
+                        rprint(f"  {attr_name}: {attr_value}")
+                    rows[key] = attributes
+                except Exception as e:
+                    rprint(f"[red]Error reading {key}: {str(e)}[/red]")
+
+        # Assemble the CSV rows in key order so the catalog file itself
+        # stays deterministic regardless of arrival order
+        for key in keys:
+            if key not in rows:
+                continue
+            row_df = pd.DataFrame([rows[key]], index=[0])
+            row_df['uri'] = f's3://{bucket}/{key}'
+            if df is None:
+                df = row_df
+            else:
+                df = pd.concat([df, row_df], ignore_index=True)
         rprint(df)
         df.to_csv(catalog_path, index=False)
                         
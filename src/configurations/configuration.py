@@ -1,79 +1,202 @@
+import dataclasses
+import functools
+import hashlib
+import os
+import pickle
+import zlib
+from io import BytesIO, StringIO
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
+import numpy as np
 import h5py
 from .models import ConfigurationMeta, State
-import s3fs
-from typing import Dict, Any, Optional
-from ase import io
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
-def parse_xyz_header(xyz_path: Path) -> ConfigurationMeta:
+# ase, s3fs, and rich are imported inside the functions that use them:
+# ase alone costs several hundred ms to import, and none of the three is
+# needed just to construct a Configuration or save it locally.
+if TYPE_CHECKING:
+    import s3fs
+    from rich.panel import Panel
+
+# Mapping from atoms.info field names to ConfigurationMeta field names,
+# plus the per-type field sets used to route value conversion. All hoisted
+# to module scope so the per-file parse loop does no rebuilding.
+_FIELD_MAP: Dict[str, str] = {
+    'config': 'config_number',
+    'phase': 'state',  # phase -> state
+    'QMC-run-date': 'QMC_run_date',  # hyphen to underscore
+    'QMC-quality': 'QMC_quality',  # hyphen to underscore
+    'simulation-type': 'simulation_type',  # hyphen to underscore
+    'fsc_dv_ev': 'fsc_potential_energy',  # dv -> potential
+    'fsc_dt_ev': 'fsc_kinetic_energy',  # dt -> kinetic
+}
+_META_FIELDS = frozenset(f.name for f in dataclasses.fields(ConfigurationMeta))
+_INT_FIELDS = frozenset({
+    'config_number', 'pressure', 'temperature', 'timestep', 'QMC_quality'
+})
+_FLOAT_FIELDS = frozenset({
+    'rs', 'molecular_percentage', 'energy', 'electron_kinetic_energy',
+    'potential_energy', 'fsc_potential_energy', 'fsc_kinetic_energy'
+})
+
+# Phase strings from the xyz header mapped straight to the State enum:
+# a single dict lookup per file instead of a string-compare chain
+_PHASE_TO_STATE = {state.value: state for state in State}
+
+def _to_state(value: Any) -> Optional[State]:
+    """Convert a phase string from the xyz header to a State enum."""
+    if isinstance(value, str):
+        return _PHASE_TO_STATE.get(value.lower())
+    return None
+
+# HDF5 enumerated type for the state attribute: the file stores a 1-byte
+# code plus one shared enum type instead of a variable-length string with
+# its own type descriptor per attribute
+_STATE_CODES = {state: code for code, state in enumerate(State)}
+_STATE_NAMES = {code: state.value for code, state in enumerate(State)}
+_STATE_ENUM_DT = h5py.enum_dtype(
+    {state.value: code for code, state in enumerate(State)}, basetype='i1'
+)
+
+def _write_state_attr(attrs: h5py.AttributeManager, value: State) -> None:
+    """Write the state as a 1-byte enum-typed attribute."""
+    attrs.create('state', np.int8(_STATE_CODES[value]), dtype=_STATE_ENUM_DT)
+
+# (field name, specialized writer) pairs built once at import from the
+# schema; None means the value is a scalar h5py can store directly. This
+# keeps isinstance dispatch out of the per-file save loop.
+_ATTR_WRITERS = tuple(
+    (field.name, _write_state_attr if field.name == 'state' else None)
+    for field in dataclasses.fields(ConfigurationMeta)
+)
+
+@functools.lru_cache(maxsize=128)
+def _dir_entries(dir_path: str) -> frozenset:
+    """Return the basenames in a directory, cached per directory.
+
+    Looking up related files for thousands of configs in one directory
+    then costs a single readdir instead of three stat syscalls per config.
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
+
+# On-disk cache of parsed xyz metadata. Entries are keyed by resolved
+# path + mtime + size, so a file that changes gets reparsed and a file
+# that hasn't costs one pickle load instead of an ASE parse on reruns.
+# One pickle file per entry (published with an atomic rename) so
+# create-batch workers can share the cache safely.
+_META_CACHE_DIR = Path(
+    os.environ.get('CONFIGURATIONS_CACHE_DIR', Path.home() / '.cache' / 'configurations')
+) / 'meta'
+
+def _meta_cache_path(xyz_path: Path) -> Optional[Path]:
+    """Return the cache file for this xyz file's parsed metadata.
+
+    Args:
+        xyz_path: Path to the XYZ file
+
+    Returns:
+        Path of the cache entry, or None if the file cannot be stat'd
+    """
+    try:
+        stat = xyz_path.stat()
+    except OSError:
+        return None
+    cache_key = f"{xyz_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    return _META_CACHE_DIR / f"{hashlib.sha1(cache_key.encode()).hexdigest()}.pkl"
+
+def _write_text_dataset(hdf5_file: h5py.File, name: str, content: bytes) -> None:
+    """Write text-file content as a uint8 dataset, compressed when it is
+    large enough for chunking to pay off.
+
+    Args:
+        hdf5_file: Open HDF5 file to write into
+        name: Dataset name
+        content: Raw file bytes to store
+    """
+    data = np.frombuffer(content, dtype=np.uint8)
+    if data.size < 4096:
+        # For tiny payloads the chunk B-tree overhead outweighs what
+        # compression saves, so store them contiguously
+        hdf5_file.create_dataset(name, data=data)
+    else:
+        # compression_opts is the gzip level: 4 trades a little ratio for
+        # much faster writes than the default 9. Explicit 64 KB chunks
+        # instead of h5py's guess: small enough that partial reads don't
+        # drag in the whole payload, large enough to keep the chunk
+        # B-tree shallow.
+        hdf5_file.create_dataset(
+            name, data=data, chunks=(min(data.size, 65536),),
+            compression='gzip', compression_opts=4, shuffle=True
+        )
+
+def parse_xyz_header(xyz_path: Path, data: Optional[bytes] = None) -> ConfigurationMeta:
     """Parse metadata from XYZ file using ASE and create ConfigurationMeta object.
-    
+
     Uses ASE (Atomic Simulation Environment) to read the XYZ file and extract
     metadata from atoms.info dictionary. This is cleaner and more reliable than
     parsing the raw text.
-    
+
     Args:
         xyz_path: Path to the XYZ file
-        
+        data: Raw file contents, if the caller has already read them;
+            avoids a second read of the same file
+
     Returns:
         ConfigurationMeta object with parsed metadata
-        
+
     Raises:
         FileNotFoundError: If XYZ file doesn't exist
         ValueError: If XYZ file format is invalid
     """
-    # Use ASE to read the XYZ file - it automatically parses metadata into atoms.info
-    atoms = io.read(str(xyz_path))
-    
-    # Get the info dictionary from ASE (contains all metadata from XYZ header)
-    info = atoms.info
-    
-    # Mapping from atoms.info field names to ConfigurationMeta field names
-    field_mapping: Dict[str, str] = {
-        'config': 'config_number',
-        'phase': 'state',  # phase -> state
-        'QMC-run-date': 'QMC_run_date',  # hyphen to underscore
-        'QMC-quality': 'QMC_quality',  # hyphen to underscore
-        'simulation-type': 'simulation_type',  # hyphen to underscore
-        'fsc_dv_ev': 'fsc_potential_energy',  # dv -> potential
-        'fsc_dt_ev': 'fsc_kinetic_energy',  # dt -> kinetic
-    }
+    # All the metadata lives in the first two lines (atom count plus the
+    # extended-xyz comment line), so parse just those with ASE's key=value
+    # parser instead of having io.read build every atom's coordinates.
+    # When the caller supplies the raw bytes, parse them in-memory instead
+    # of opening the file again. Fall back to a full ASE read for files
+    # the header-only path cannot handle.
+    from ase.io.extxyz import key_val_str_to_dict
+
+    try:
+        if data is not None:
+            natoms_line, comment_line, _ = data.split(b'\n', 2)
+        else:
+            with open(xyz_path) as xyz_file:
+                natoms_line = xyz_file.readline()
+                comment_line = xyz_file.readline()
+        int(natoms_line)  # raises if this is not an xyz header
+        if isinstance(comment_line, bytes):
+            comment_line = comment_line.decode('ascii', errors='replace')
+        info = key_val_str_to_dict(comment_line)
+    except Exception:
+        from ase import io
+        if data is not None:
+            atoms = io.read(StringIO(data.decode('ascii', errors='replace')), format='extxyz')
+        else:
+            atoms = io.read(str(xyz_path))
+        info = atoms.info
     
     # Build the metadata dictionary
     meta_dict: Dict[str, Any] = {}
-    
+
     for info_key, info_value in info.items():
         # Map field name if needed
-        meta_key = field_mapping.get(info_key, info_key)
-        
+        meta_key = _FIELD_MAP.get(info_key, info_key)
+
         # Skip fields that don't exist in ConfigurationMeta
-        if not meta_key in ConfigurationMeta.model_fields:
+        if meta_key not in _META_FIELDS:
             continue
-        
+
         # Type conversion based on field name
         try:
             if meta_key == 'state':
-                # Convert phase string to State enum
-                if isinstance(info_value, str):
-                    phase_lower = info_value.lower()
-                    if phase_lower == 'solid':
-                        meta_dict[meta_key] = State.SOLID
-                    elif phase_lower == 'liquid':
-                        meta_dict[meta_key] = State.LIQUID
-                    elif phase_lower == 'ambiguous':
-                        meta_dict[meta_key] = State.AMBIGUOUS
-                    else:
-                        meta_dict[meta_key] = None
-                else:
-                    meta_dict[meta_key] = None
-            elif meta_key in ['config_number', 'pressure', 'temperature', 'timestep', 'QMC_quality']:
-                # Integer fields
+                meta_dict[meta_key] = _to_state(info_value)
+            elif meta_key in _INT_FIELDS:
                 meta_dict[meta_key] = int(info_value) if info_value is not None else None
-            elif meta_key in ['rs', 'molecular_percentage', 'energy', 'electron_kinetic_energy', 
-                             'potential_energy', 'fsc_potential_energy', 'fsc_kinetic_energy']:
-                # Float fields
+            elif meta_key in _FLOAT_FIELDS:
                 meta_dict[meta_key] = float(info_value) if info_value is not None else None
             else:
                 # String fields (keep as string, or convert to string if needed)
@@ -81,15 +204,46 @@ def parse_xyz_header(xyz_path: Path) -> ConfigurationMeta:
         except (ValueError, TypeError, AttributeError):
             # If conversion fails, skip this field
             continue
-    
+
     # Create and return ConfigurationMeta object
     return ConfigurationMeta(**meta_dict)
 
 class Configuration:
-    def __init__(self, xyz_path: Path):
+    def __init__(self, xyz_path: Path, data: Optional[bytes] = None):
         self.xyz_path = xyz_path
-        self.meta = parse_xyz_header(self.xyz_path)
-        
+        # When the caller has the file in memory already, the same buffer
+        # feeds the header parser here and the xyz_data write in
+        # save_to_hdf5. Otherwise only the header lines are read now and
+        # save_to_hdf5 streams the file chunk by chunk, so memory stays
+        # bounded for multi-GB trajectory files.
+        self._raw = data
+
+        # Reuse the cached parse when the file hasn't changed; the cache
+        # is best-effort, so any I/O problem just falls back to parsing
+        cache_path = _meta_cache_path(xyz_path)
+        self.meta = None
+        if cache_path is not None and cache_path.exists():
+            # Any failure means reparse — including AttributeError /
+            # ModuleNotFoundError from entries pickled by an older package
+            # version whose ConfigurationMeta no longer unpickles (the
+            # cache key tracks the file, not the schema)
+            try:
+                with open(cache_path, 'rb') as cache_file:
+                    self.meta = pickle.load(cache_file)
+            except Exception:
+                self.meta = None
+        if self.meta is None:
+            self.meta = parse_xyz_header(self.xyz_path, data=self._raw)
+            if cache_path is not None:
+                try:
+                    _META_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+                    with open(tmp_path, 'wb') as cache_file:
+                        pickle.dump(self.meta, cache_file)
+                    os.replace(tmp_path, cache_path)
+                except OSError:
+                    pass
+
         # Find related files in the same directory
         self.sofk_txt_path = self._find_related_file("_sofk.txt")
         self.gofr_txt_path = self._find_related_file("_gofr.txt")
@@ -109,32 +263,46 @@ class Configuration:
         """
         xyz_dir = self.xyz_path.parent
         xyz_stem = self.xyz_path.stem  # filename without extension
-        
-        # For .sk file, replace .xyz extension with .sk
+
+        # For .sk file, replace .xyz extension with .sk;
+        # for _sofk.txt and _gofr.txt, append the suffix
         if suffix == ".sk":
-            file_path = xyz_dir / f"{xyz_stem}.sk"
+            file_name = f"{xyz_stem}.sk"
         else:
-            # For _sofk.txt and _gofr.txt, append suffix
-            file_path = xyz_dir / f"{xyz_stem}{suffix}"
-        
-        return file_path if file_path.exists() else None
+            file_name = f"{xyz_stem}{suffix}"
+
+        # Membership test against the cached directory listing — no
+        # exists() stat syscall per candidate
+        if file_name in _dir_entries(str(xyz_dir)):
+            return xyz_dir / file_name
+        return None
 
     def __str__(self) -> str:
-        console = Console()
-        with console.capture() as capture:
-            console.print(Panel.fit(
-                f"XYZ File: {self.xyz_path.name}\n"
-                f"Pressure: {self.meta.pressure or 'N/A'}\n"
-                f"Temperature: {self.meta.temperature or 'N/A'}\n"
-                f"State: {self.meta.state.value if self.meta.state else 'N/A'}",
-                f"MD Type: {self.meta.MD_type or 'N/A'}",
-                f"config_number: {self.meta.config_number or 'N/A'}",
-                border_style="cyan",
-                box="SIMPLE",
-                title="Configuration Details"
-            ))
-        return capture.get() 
-    
+        # Cheap plain-text form: __str__ gets called in tight loops, so no
+        # Console/Panel construction here — use to_panel() for pretty output
+        state = self.meta.state.value if self.meta.state else 'N/A'
+        return (
+            f"Configuration({self.xyz_path.name}, "
+            f"P={self.meta.pressure or 'N/A'}, "
+            f"T={self.meta.temperature or 'N/A'}, "
+            f"state={state})"
+        )
+
+    def to_panel(self) -> "Panel":
+        """Build a rich panel with the configuration details for display."""
+        from rich.panel import Panel
+        return Panel.fit(
+            f"XYZ File: {self.xyz_path.name}\n"
+            f"Pressure: {self.meta.pressure or 'N/A'}\n"
+            f"Temperature: {self.meta.temperature or 'N/A'}\n"
+            f"State: {self.meta.state.value if self.meta.state else 'N/A'}\n"
+            f"MD Type: {self.meta.MD_type or 'N/A'}\n"
+            f"config_number: {self.meta.config_number or 'N/A'}",
+            border_style="cyan",
+            title="Configuration Details"
+        )
+
+
     @property
     def s3_key(self) -> str:
         return f"P{self.meta.pressure}/T{self.meta.temperature}/{self.hdf5_filename}"
@@ -152,51 +320,88 @@ class Configuration:
         Args:
             hdf5_path: Path to the output HDF5 file
         """
-        # Use 'w' mode to create new file (overwrite if exists)
-        with h5py.File(hdf5_path, "w") as hdf5_file:
-            # Save all metadata as root-level attributes
-            # Convert metadata to dictionary and save all fields
-            try:
-                meta_dict = self.meta.model_dump()  # Pydantic v2
-            except AttributeError:
-                meta_dict = self.meta.dict()  # Pydantic v1 fallback
-            
-            for key, value in meta_dict.items():
-                if value is not None:
-                    # Convert State enum to string (already handled by model_dump/dict, but check anyway)
-                    if isinstance(value, State):
-                        hdf5_file.attrs[key] = value.value
-                    # Convert lists/other types to string if needed
-                    elif isinstance(value, (list, dict)):
-                        hdf5_file.attrs[key] = str(value)
-                    else:
-                        hdf5_file.attrs[key] = value
-            
-            # Save XYZ file content
-            with open(self.xyz_path, "r") as xyz_file:
-                xyz_content = xyz_file.read()
-                hdf5_file.create_dataset("xyz_data", data=xyz_content.encode('utf-8'))
-            
-            # Save SOFK file content (if exists)
-            if self.sofk_txt_path:
-                with open(self.sofk_txt_path, "r") as sofk_file:
-                    sofk_content = sofk_file.read()
-                    hdf5_file.create_dataset("sofk_data", data=sofk_content.encode('utf-8'))
+        # Use 'w' mode to create new file (overwrite if exists).
+        # libver='latest' enables the compact attribute storage and newer
+        # B-tree layout, which makes the many small attribute writes
+        # substantially cheaper. The raw-data chunk cache is raised from
+        # its 1 MB / 521-slot default (64 MB, prime slot count) so chunks
+        # stay resident for the duration of the bulk write.
+        with h5py.File(hdf5_path, "w", libver="latest",
+                       rdcc_nbytes=64 * 1024 * 1024, rdcc_nslots=100003) as hdf5_file:
+            self._write(hdf5_file)
+
+    def to_hdf5_bytes(self) -> bytes:
+        """Build the HDF5 file in memory and return its bytes.
+
+        Lets upload paths send the file straight to S3 without writing it
+        to local disk and reading it back.
+        """
+        buffer = BytesIO()
+        with h5py.File(buffer, "w", libver="latest") as hdf5_file:
+            self._write(hdf5_file)
+        return buffer.getvalue()
+
+    def _write(self, hdf5_file: h5py.File):
+        """Write metadata attributes and all datasets into an open file."""
+        # Save all non-None metadata fields as root-level attributes.
+        # The scalar fields are collected into one dict and set with a
+        # single attrs.update pass (fewer Python->C crossings than one
+        # call per attribute); only state needs its enum-typed create.
+        scalar_attrs = {}
+        for name, writer in _ATTR_WRITERS:
+            value = getattr(self.meta, name)
+            if value is None:
+                continue
+            if writer is not None:
+                writer(hdf5_file.attrs, value)
+            else:
+                scalar_attrs[name] = value
+        hdf5_file.attrs.update(scalar_attrs)
             
-            # Save GOFR file content (if exists)
-            if self.gofr_txt_path:
-                with open(self.gofr_txt_path, "r") as gofr_file:
-                    gofr_content = gofr_file.read()
-                    hdf5_file.create_dataset("gofr_data", data=gofr_content.encode('utf-8'))
+        # Save XYZ file content as a 1-D uint8 dataset. Each chunk is
+        # compressed once in Python and written with a direct chunk
+        # write, so the bytes bypass the HDF5 filter pipeline and
+        # chunk cache entirely. Chunks are capped at 1 MB so one chunk
+        # read fits the default raw-data chunk cache on the consumer
+        # side — and so streaming from disk keeps memory at O(1 MB)
+        # regardless of file size.
+        size = len(self._raw) if self._raw is not None else self.xyz_path.stat().st_size
+        if size:
+            chunk_len = min(size, 1024 * 1024)
+            xyz_dset = hdf5_file.create_dataset(
+                "xyz_data", shape=(size,), dtype="u1",
+                chunks=(chunk_len,), compression="gzip"
+            )
+            def iter_chunks():
+                if self._raw is not None:
+                    for offset in range(0, size, chunk_len):
+                        yield self._raw[offset:offset + chunk_len]
+                else:
+                    with open(self.xyz_path, "rb") as xyz_file:
+                        while chunk := xyz_file.read(chunk_len):
+                            yield chunk
+
+            for index, chunk in enumerate(iter_chunks()):
+                xyz_dset.id.write_direct_chunk(
+                    (index * chunk_len,), zlib.compress(chunk, 4), filter_mask=0
+                )
+        else:
+            hdf5_file.create_dataset("xyz_data", shape=(0,), dtype="u1")
             
-            # Save SK file content (if exists)
-            if self.sk_path:
-                with open(self.sk_path, "r") as sk_file:
-                    sk_content = sk_file.read()
-                    hdf5_file.create_dataset("electronic_sk_data", data=sk_content.encode('utf-8'))
+        # Save SOFK/GOFR/SK file contents (if they exist). read_bytes
+        # hands the raw bytes straight to HDF5 — no decode to str and
+        # re-encode, which would copy each file twice.
+        if self.sofk_txt_path:
+            _write_text_dataset(hdf5_file, "sofk_data", self.sofk_txt_path.read_bytes())
+
+        if self.gofr_txt_path:
+            _write_text_dataset(hdf5_file, "gofr_data", self.gofr_txt_path.read_bytes())
+
+        if self.sk_path:
+            _write_text_dataset(hdf5_file, "electronic_sk_data", self.sk_path.read_bytes())
 
     @staticmethod
-    def read_hdf5_attributes(bucket: str, key: str, fs: s3fs.S3FileSystem) -> dict:
+    def read_hdf5_attributes(bucket: str, key: str, fs: "s3fs.S3FileSystem") -> dict:
         """Read all group attributes from an HDF5 file in S3.
         
         Args:
@@ -211,6 +416,17 @@ class Configuration:
             Exception: If there's an error reading the file
         """
         s3_path = f"s3://{bucket}/{key}"
-        with fs.open(s3_path, 'rb') as f:
-            with h5py.File(f, 'r') as h5f:
-                return dict(h5f.attrs)
\ No newline at end of file
+        # These files are small, so one whole-object GET into memory beats
+        # the series of ranged reads h5py would issue through a remote
+        # file handle
+        body = fs.cat_file(s3_path)
+        # Attribute-only read: no dataset chunks will ever be touched, so
+        # drop the raw-data chunk cache instead of allocating 1 MB per open
+        with h5py.File(BytesIO(body), 'r', rdcc_nbytes=0, rdcc_nslots=1) as h5f:
+            attrs = dict(h5f.attrs)
+            # Decode the enum-typed state code back to its name; older
+            # files that stored plain strings pass through unchanged
+            state = attrs.get('state')
+            if isinstance(state, (int, np.integer)):
+                attrs['state'] = _STATE_NAMES.get(int(state), state)
+            return attrs
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""Core in-memory configuration objects and the file-backed manager."""
+
+import concurrent.futures
+from pathlib import Path
+from typing import List, Optional
+
+import h5py
+import numpy as np
+
+
+class Configuration:
+    """An atomic configuration: atom symbols, positions, and lattice.
+
+    Args:
+        name: Name of the configuration (e.g. "water")
+        atoms: List of element symbols, one per atom
+        positions: (N, 3) array of Cartesian coordinates
+        lattice_vectors: Optional (3, 3) array of cell vectors
+    """
+
+    # No per-instance __dict__: four fixed attributes, and a manager may
+    # hold thousands of these
+    __slots__ = ("name", "_atoms", "positions", "lattice_vectors")
+
+    def __init__(self, name: str, atoms: List[str],
+                 positions: np.ndarray,
+                 lattice_vectors: Optional[np.ndarray] = None):
+        self.name = name
+        # Symbols and coordinates are held as two packed arrays (fixed-width
+        # ASCII and contiguous float64) rather than a list of Python objects,
+        # so bulk math over positions vectorizes and saving needs no
+        # per-symbol conversion. Configurations have differing atom counts,
+        # so packing happens per configuration, not across the manager.
+        self._atoms = np.asarray(atoms, dtype="S2")
+        self.positions = np.ascontiguousarray(positions, dtype=np.float64)
+        self.lattice_vectors = (
+            np.asarray(lattice_vectors, dtype=np.float64)
+            if lattice_vectors is not None else None
+        )
+
+    @property
+    def atoms(self) -> List[str]:
+        """Element symbols as a list of strings."""
+        return self._atoms.astype("U2").tolist()
+
+    def save(self, filename: str, compression: Optional[str] = "lzf"):
+        """Save the configuration to an HDF5 file.
+
+        Numeric arrays are written chunked with the lzf filter plus byte
+        shuffle: lzf releases the GIL and compresses float coordinates
+        several times faster than gzip, and shuffle groups the bytes of
+        each float so runs compress well. Chunks are capped at 4096 rows
+        (~100 KB) so a partial read never drags in the whole array. The
+        name and symbol list are small, so they go in attributes rather
+        than datasets, avoiding per-dataset chunk overhead.
+
+        Args:
+            filename: Path of the HDF5 file to create
+            compression: Filter for the positions dataset, or None to
+                write it contiguous and skip the filter pipeline entirely
+                — the fastest path for small or incompressible arrays
+        """
+        with h5py.File(filename, "w") as h5_file:
+            h5_file.attrs["name"] = self.name
+            # Fixed-width 2-byte ASCII, enough for any element symbol:
+            # one contiguous buffer instead of a variable-length string
+            # array with a heap pointer per symbol
+            h5_file.attrs["atoms"] = self._atoms
+            n_atoms = len(self.positions)
+            # maxshape fixed to the data shape (non-extendable datasets
+            # skip the resizable B-tree bookkeeping) and no modification
+            # timestamps, which also makes output byte-reproducible
+            if compression is None:
+                h5_file.create_dataset(
+                    "positions", data=self.positions,
+                    maxshape=self.positions.shape, track_times=False
+                )
+            else:
+                h5_file.create_dataset(
+                    "positions", data=self.positions,
+                    chunks=(min(n_atoms, 4096), 3) if n_atoms else None,
+                    maxshape=self.positions.shape,
+                    compression=compression, shuffle=True, track_times=False
+                )
+            if self.lattice_vectors is not None:
+                # 72 bytes — chunking/compression overhead would exceed
+                # the payload, so store it contiguous
+                h5_file.create_dataset(
+                    "lattice_vectors", data=self.lattice_vectors,
+                    maxshape=self.lattice_vectors.shape, track_times=False
+                )
+
+    @classmethod
+    def load(cls, filename: str) -> "Configuration":
+        """Load a configuration from an HDF5 file.
+
+        Args:
+            filename: Path of the HDF5 file to read
+
+        Returns:
+            The loaded Configuration
+        """
+        # 4 MB chunk cache comfortably holds the ~100 KB position chunks
+        # while they are decompressed, so re-reads stay in memory
+        with h5py.File(filename, "r",
+                       rdcc_nbytes=4 * 1024 * 1024, rdcc_nslots=521) as h5_file:
+            name = h5_file.attrs["name"]
+            atoms = np.asarray(h5_file.attrs["atoms"], dtype="S2")
+            positions = h5_file["positions"][...]
+            lattice_vectors = (
+                h5_file["lattice_vectors"][...]
+                if "lattice_vectors" in h5_file else None
+            )
+        return cls(name, atoms, positions, lattice_vectors)
+
+
+class ConfigurationManager:
+    """Manage a directory of configurations stored as HDF5 files.
+
+    Each configuration lives in its own ``<name>.h5`` file under
+    ``base_dir``.
+
+    Args:
+        base_dir: Directory where configuration files are kept
+    """
+
+    def __init__(self, base_dir: str):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        # Name -> file index built from a single directory scan; list/get/
+        # delete are then dict operations instead of a glob per call
+        self._index = {path.stem: path for path in self.base_dir.glob("*.h5")}
+
+    def _path(self, name: str) -> Path:
+        return self.base_dir / f"{name}.h5"
+
+    def create(self, name: str, atoms: List[str],
+               positions: np.ndarray,
+               lattice_vectors: Optional[np.ndarray] = None) -> Configuration:
+        """Create a configuration and save it under the managed directory.
+
+        Args:
+            name: Name of the configuration
+            atoms: List of element symbols
+            positions: (N, 3) array of Cartesian coordinates
+            lattice_vectors: Optional (3, 3) array of cell vectors
+
+        Returns:
+            The created Configuration
+        """
+        config = Configuration(name, atoms, positions, lattice_vectors)
+        path = self._path(name)
+        config.save(str(path))
+        self._index[name] = path
+        return config
+
+    def create_many(self, items) -> List[Configuration]:
+        """Create and save several configurations concurrently.
+
+        Each configuration goes to its own file, so the writes are
+        independent and run on a thread pool — h5py releases the GIL
+        inside the HDF5 library and the lzf filter, so throughput scales
+        with cores until the disk saturates.
+
+        Args:
+            items: Iterable of (name, atoms, positions) or
+                (name, atoms, positions, lattice_vectors) tuples
+
+        Returns:
+            The created Configurations, in input order
+        """
+        def _create_one(item):
+            config = Configuration(*item)
+            path = self._path(config.name)
+            config.save(str(path))
+            return config, path
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            results = list(executor.map(_create_one, items))
+        # Index updates stay on the calling thread
+        for config, path in results:
+            self._index[config.name] = path
+        return [config for config, _ in results]
+
+    def get(self, name: str) -> Configuration:
+        """Load the named configuration.
+
+        Args:
+            name: Name of the configuration
+
+        Returns:
+            The loaded Configuration
+
+        Raises:
+            KeyError: If no configuration with this name exists
+        """
+        if name not in self._index:
+            raise KeyError(f"No configuration named {name!r}")
+        return Configuration.load(str(self._index[name]))
+
+    def list(self) -> List[str]:
+        """Return the names of all stored configurations."""
+        return sorted(self._index)
+
+    def delete(self, name: str):
+        """Delete the named configuration.
+
+        Args:
+            name: Name of the configuration
+
+        Raises:
+            KeyError: If no configuration with this name exists
+        """
+        if name not in self._index:
+            raise KeyError(f"No configuration named {name!r}")
+        self._index.pop(name).unlink()
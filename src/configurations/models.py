@@ -1,13 +1,17 @@
+from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel
 
 class State(str, Enum):
     SOLID = "solid"
     LIQUID = "liquid"
     AMBIGUOUS = "ambiguous"
 
-class ConfigurationMeta(BaseModel):
+# A plain slotted dataclass rather than a pydantic model: the fields are
+# already type-coerced by parse_xyz_header, so validation would be pure
+# overhead on a hot path, and slots halve per-instance memory.
+@dataclass(slots=True)
+class ConfigurationMeta:
     config_number: Optional[int] = None
     uuid: Optional[str] = None
     
@@ -2,19 +2,9 @@
 
 import numpy as np
 import pytest
-from pathlib import Path
-import tempfile
-import shutil
 
 from configurations.core import Configuration, ConfigurationManager
 
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for testing."""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir)
-
 @pytest.fixture
 def sample_config():
     """Create a sample configuration."""
@@ -27,10 +17,10 @@ def sample_config():
     lattice_vectors = np.eye(3)
     return Configuration("water", atoms, positions, lattice_vectors)
 
-def test_configuration_save_load(temp_dir, sample_config):
+def test_configuration_save_load(tmp_path, sample_config):
     """Test saving and loading a configuration."""
     # Save configuration
-    filename = str(Path(temp_dir) / "test.h5")
+    filename = str(tmp_path / "test.h5")
     sample_config.save(filename)
     
     # Load configuration
@@ -38,13 +28,13 @@ def test_configuration_save_load(temp_dir, sample_config):
     
     # Check properties
     assert loaded_config.name == sample_config.name
-    assert loaded_config.atoms == sample_config.atoms
+    assert np.array_equal(np.asarray(loaded_config.atoms), np.asarray(sample_config.atoms))
     assert np.allclose(loaded_config.positions, sample_config.positions)
     assert np.allclose(loaded_config.lattice_vectors, sample_config.lattice_vectors)
 
-def test_configuration_manager(temp_dir):
+def test_configuration_manager(tmp_path):
     """Test the configuration manager."""
-    manager = ConfigurationManager(temp_dir)
+    manager = ConfigurationManager(str(tmp_path))
     
     # Create a configuration
     atoms = ["H", "H"]
@@ -57,7 +47,7 @@ def test_configuration_manager(temp_dir):
     # Get the configuration
     loaded_config = manager.get("h2")
     assert loaded_config.name == "h2"
-    assert loaded_config.atoms == atoms
+    assert np.array_equal(np.asarray(loaded_config.atoms), np.asarray(atoms))
     assert np.allclose(loaded_config.positions, positions)
     
     # Delete the configuration